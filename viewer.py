@@ -4,11 +4,14 @@
 # dependencies = [
 #     "beautifulsoup4",
 #     "click",
+#     "lxml",
 #     "pywebview",
 #     "requests",
+#     "xxhash",
 # ]
 # ///
 
+import functools
 import hashlib
 import json
 import os
@@ -16,9 +19,11 @@ import queue
 import re
 import shutil
 import sys
+import tempfile
 import threading
-import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
+from http import HTTPStatus
 from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from io import BytesIO
 from pathlib import Path
@@ -27,12 +32,30 @@ from urllib.parse import urljoin, urlparse
 
 import click
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import xxhash
+from bs4 import BeautifulSoup, FeatureNotFound
 
 os.environ['WEBKIT_DISABLE_DMABUF_RENDERER'] = '1'  # must be set before importing webview
 import webview
 
-CSS_URL_RE = re.compile(r"url\(([^)]+)\)")
+# url(...) and @import in a single alternation so the CSS text is scanned once
+CSS_ASSET_RE = re.compile(
+    r"url\(\s*(?P<uq>['\"]?)(?P<u>.*?)(?P=uq)\s*\)"
+    r"|@import\s+(?:url\()?(?P<iq>['\"])(?P<i>.*?)(?P=iq)\)?"
+)
+# <link href>, <script src>, <img src> with a non-empty URL, matched in a single tree walk
+ASSET_SELECTOR = "link[href]:not([href='']), script[src]:not([src='']), img[src]:not([src=''])"
+# Change detection only needs a fast hash; sha256 can be selected with the "hash-algorithm" config key
+HASHERS = {"xxh3": xxhash.xxh3_64, "sha256": hashlib.sha256}
+DEFAULT_HASH_ALGORITHM = "xxh3"
+# Upper bound for the refetch delay while the target is unreachable
+MAX_BACKOFF_SEC = 600
+# Read size when streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Concurrent asset downloads per snapshot (also the size of the HTTP connection pool)
+DOWNLOAD_WORKERS = 16
 
 @dataclass
 class SnapshotResult:
@@ -40,6 +63,32 @@ class SnapshotResult:
     html_path: Path
 
 class SilentHTTPRequestHandler(SimpleHTTPRequestHandler):
+    """Serves the cache with validators so the webview can revalidate with 304s on reload."""
+
+    # Shorter than RefetchThread's minimum interval, so a reload never reuses a stale asset
+    cache_control = "public, max-age=5"
+
+    def send_head(self):
+        self._etag = None
+        path = self.translate_path(self.path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return super().send_head()
+        if os.path.isfile(path):
+            self._etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            if self._etag in self.headers.get("If-None-Match", ""):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.end_headers()
+                return None
+        return super().send_head()
+
+    def end_headers(self):
+        if getattr(self, "_etag", None):
+            self.send_header("ETag", self._etag)
+            self.send_header("Cache-Control", self.cache_control)
+        super().end_headers()
+
     def log_message(self, format, *args):
         pass
 
@@ -47,38 +96,60 @@ class SilentHTTPRequestHandler(SimpleHTTPRequestHandler):
 def _requests_session(user_agent: str) -> requests.Session:
     s = requests.Session()
     s.headers.update({"User-Agent": user_agent})
+    adapter = HTTPAdapter(
+        pool_connections=DOWNLOAD_WORKERS,
+        pool_maxsize=DOWNLOAD_WORKERS,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    )
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
     s.timeout = 20
     return s
 
 
+@functools.lru_cache(maxsize=4096)
 def safe_path_for_url(url: str, cache_root: Path) -> Path:
-    """Map a URL to a safe local path under cache_root."""
-    parsed = urlparse(url)
-    # Build a relative path using netloc + path
-    rel = Path(parsed.netloc) / parsed.path.lstrip("/")
-    rel = Path(*rel.parts[1:])
-    if rel.name == "":
-        rel = rel / "index.html"
-    # Ensure extension for routes without one
-    if not rel.suffix:
-        rel = rel.with_suffix(".html")
-    local_path = cache_root / rel
-    local_path.parent.mkdir(parents=True, exist_ok=True)
-    return local_path
-
-
-def extract_asset_urls(base_url: str, html: str) -> set[str]:
-    soup = BeautifulSoup(html, "html.parser")
+    """Map a URL to a safe local path under cache_root.
+    Pure (no filesystem access) so results can be memoized; callers that write create the parent.
+    """
+    # Plain string ops; pathlib allocates an object per operation on this hot path.
+    # Empty and "." segments are dropped, as Path would.
+    segments = [s for s in urlparse(url).path.split("/") if s and s != "."]
+    if not segments:
+        return cache_root / "index.html"
+    rel = "/".join(segments)
+    # Ensure extension for routes without one (same rule as Path.suffix)
+    name = segments[-1]
+    dot = name.rfind(".")
+    if not 0 < dot < len(name) - 1:
+        rel += ".html"
+    return cache_root / rel
+
+
+def _parse(html: str) -> BeautifulSoup:
+    # lxml parses in C; fall back to the pure-Python parser if it is missing
+    try:
+        return BeautifulSoup(html, "lxml")
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser")
+
+
+def _urljoin_cached(base_url: str, u: str, join_cache: Optional[dict[str, str]]) -> str:
+    if join_cache is None:
+        return urljoin(base_url, u)
+    abs_u = join_cache.get(u)
+    if abs_u is None:
+        abs_u = join_cache[u] = urljoin(base_url, u)
+    return abs_u
+
+
+def extract_asset_urls_from_soup(soup: BeautifulSoup, base_url: str, join_cache: Optional[dict[str, str]] = None) -> set[str]:
     urls: set[str] = set()
 
     # <link href>, <script src>, <img src>
-    for tag, attr in (("link", "href"), ("script", "src"), ("img", "src")):
-        for el in soup.find_all(tag):
-            u = el.get(attr)
-            if not u:
-                continue
-            abs_u = urljoin(base_url, u)
-            urls.add(abs_u)
+    for el in soup.select(ASSET_SELECTOR):
+        attr = "href" if el.name == "link" else "src"
+        urls.add(_urljoin_cached(base_url, el[attr], join_cache))
 
     # CSS @import and url(...) inside inline <style>
     for style in soup.find_all("style"):
@@ -91,38 +162,29 @@ def extract_asset_urls(base_url: str, html: str) -> set[str]:
 
 def extract_urls_from_css(base_url: str, css_text: str) -> set[str]:
     found: set[str] = set()
-    for match in CSS_URL_RE.finditer(css_text):
-        raw = match.group(1).strip().strip("\"'")
-        if raw.startswith("data:"):
+    for match in CSS_ASSET_RE.finditer(css_text):
+        raw = match.group("u") if match.group("i") is None else match.group("i")
+        raw = raw.strip()
+        if not raw or raw.startswith("data:"):
             continue
         found.add(urljoin(base_url, raw))
-    # Basic @import capture
-    for imp in re.findall(r"@import\s+(?:url\()?['\"]([^'\"]+)['\"]\)?", css_text):
-        if imp.startswith("data:"):
-            continue
-        found.add(urljoin(base_url, imp))
     return found
 
 
-def rewrite_html_to_local(html: str, base_url: str, cache_root: Path) -> str:
-    """Rewrite asset URLs in HTML to point to our local cache server paths.
+def rewrite_soup_to_local(soup: BeautifulSoup, base_url: str, cache_root: Path, join_cache: Optional[dict[str, str]] = None) -> None:
+    """Rewrite asset URLs in the parsed HTML in place to point to our local cache server paths.
     We keep them as relative paths from the cache root HTTP server.
     """
-    soup = BeautifulSoup(html, "html.parser")
 
     def to_rel(p: Path) -> str:
         # We serve from cache_root as docroot; convert local path to URL path
         rel = p.relative_to(cache_root).as_posix()
         return f"/{rel}"
 
-    for tag, attr in (("link", "href"), ("script", "src"), ("img", "src")):
-        for el in soup.find_all(tag):
-            u = el.get(attr)
-            if not u:
-                continue
-            abs_u = urljoin(base_url, u)
-            local_p = safe_path_for_url(abs_u, cache_root)
-            el[attr] = to_rel(local_p)
+    for el in soup.select(ASSET_SELECTOR):
+        attr = "href" if el.name == "link" else "src"
+        local_p = safe_path_for_url(_urljoin_cached(base_url, el[attr], join_cache), cache_root)
+        el[attr] = to_rel(local_p)
 
     # Optionally, set a <base> to keep relative links within cache
     if not soup.find("base"):
@@ -134,40 +196,194 @@ def rewrite_html_to_local(html: str, base_url: str, cache_root: Path) -> str:
         else:
             soup.insert(0, base)
 
-    return str(soup)
 
+def atomic_write_bytes(dest: Path, data: bytes) -> None:
+    """Write data to dest via a temp file and rename, so dest is never seen half-written."""
+    fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, dest)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
 
-def download_file(session: requests.Session, url: str, dest: Path) -> bool:
-    """Download URL to dest. Returns True if content changed or new, else False."""
+
+def _digest_path(dest: Path, hash_algorithm: str) -> Path:
+    return dest.with_suffix(f"{dest.suffix}.{hash_algorithm}")
+
+
+def _meta_path(dest: Path) -> Path:
+    return dest.with_suffix(dest.suffix + ".meta.json")
+
+
+def scan_cache(cache_root: Path) -> set[Path]:
+    """All files and directories under cache_root, collected in a single walk."""
+    existing = {cache_root}
+    for dirpath, dirnames, filenames in os.walk(cache_root):
+        existing.update(Path(dirpath, name) for name in dirnames)
+        existing.update(Path(dirpath, name) for name in filenames)
+    return existing
+
+
+def _exists(p: Path, existing: Optional[set[Path]]) -> bool:
+    return p.exists() if existing is None else p in existing
+
+
+def _conditional_headers(dest: Path, existing: Optional[set[Path]] = None) -> dict[str, str]:
+    """Validators from the last download of dest, for a conditional GET."""
+    meta_path = _meta_path(dest)
+    if not _exists(dest, existing) or not _exists(meta_path, existing):
+        return {}
     try:
-        resp = session.get(url, timeout=20)
-        resp.raise_for_status()
-        content = resp.content
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
     except Exception:
+        return {}
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last-modified"):
+        headers["If-Modified-Since"] = meta["last-modified"]
+    return headers
+
+
+def _store_validators(dest: Path, resp: requests.Response, existing: Optional[set[Path]] = None) -> None:
+    meta = {
+        "etag": resp.headers.get("ETag"),
+        "last-modified": resp.headers.get("Last-Modified"),
+    }
+    meta_path = _meta_path(dest)
+    had_meta = _exists(meta_path, existing)
+    if not any(meta.values()):
+        if had_meta:
+            meta_path.unlink(missing_ok=True)
+        return
+    if had_meta:
+        try:
+            if json.loads(meta_path.read_text(encoding="utf-8")) == meta:
+                return
+        except (OSError, ValueError):
+            pass
+    atomic_write_bytes(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def download_file(
+    session: requests.Session,
+    url: str,
+    dest: Path,
+    existing: Optional[set[Path]] = None,
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+) -> bool:
+    """Download URL to dest. Returns True if content changed or new, else False.
+    The body is streamed through the hash into a temp file, so memory use stays at one chunk.
+    If given, existing (see scan_cache) answers existence checks, and dest's parent must already exist.
+    """
+    h = HASHERS[hash_algorithm]()
+    tmp = None
+    try:
+        with session.get(url, timeout=20, stream=True, headers=_conditional_headers(dest, existing)) as resp:
+            digest_path = _digest_path(dest, hash_algorithm)
+            if resp.status_code == 304:
+                if not _exists(digest_path, existing):
+                    # Cached before sidecars existed (or under another algorithm)
+                    atomic_write_bytes(digest_path, hash_file(dest, hash_algorithm).encode("ascii"))
+                return False
+            resp.raise_for_status()
+            if existing is None:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+            # Unique per download, so nothing else can write or rename it under us
+            fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".part")
+            tmp = Path(tmp_name)
+            with os.fdopen(fd, "wb") as f:
+                for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    h.update(chunk)
+                    f.write(chunk)
+
+        new_hash = h.hexdigest()
+        if _exists(digest_path, existing):
+            old_hash = digest_path.read_text(encoding="ascii").strip()
+        elif _exists(dest, existing):
+            # Cached before sidecars existed; hash it once instead of re-writing
+            old_hash = hash_file(dest, hash_algorithm)
+        else:
+            old_hash = None
+
+        if old_hash == new_hash and _exists(dest, existing):
+            tmp.unlink()
+            if not _exists(digest_path, existing):
+                atomic_write_bytes(digest_path, new_hash.encode("ascii"))
+            _store_validators(dest, resp, existing)
+            return False
+
+        # Content first: a crash in between leaves a stale digest, which forces a re-write next time
+        os.replace(tmp, dest)
+        atomic_write_bytes(digest_path, new_hash.encode("ascii"))
+        _store_validators(dest, resp, existing)
+        return True
+    except Exception:
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
         return False
 
-    old = dest.read_bytes() if dest.exists() else None
-    if old == content:
-        return False
 
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    with open(dest, "wb") as f:
-        f.write(content)
-    return True
+def compute_hash(data: bytes, hash_algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    return HASHERS[hash_algorithm](data).hexdigest()
+
+
+def hash_file(path: Path, hash_algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    h = HASHERS[hash_algorithm]()
+    with open(path, "rb") as f:
+        while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
 
 
-def compute_hash(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+def css_asset_urls(css_url: str, local: Path, hash_algorithm: str = DEFAULT_HASH_ALGORITHM) -> set[str]:
+    """Asset URLs referenced by the downloaded stylesheet at local.
+    Results are memoized in a <local>.assets.json sidecar, valid while the stylesheet's URL and digest match.
+    """
+    digest_path = _digest_path(local, hash_algorithm)
+    memo_path = local.with_suffix(local.suffix + ".assets.json")
+    digest = digest_path.read_text(encoding="ascii").strip() if digest_path.exists() else None
+    if digest is not None:
+        try:
+            memo = json.loads(memo_path.read_text(encoding="utf-8"))
+            if memo["url"] == css_url and memo["digest"] == digest:
+                return set(memo["assets"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    css_text = local.read_text(encoding="utf-8", errors="ignore")
+    found = extract_urls_from_css(css_url, css_text)
+    if digest is not None:
+        memo = {"url": css_url, "digest": digest, "assets": sorted(found)}
+        atomic_write_bytes(memo_path, json.dumps(memo).encode("utf-8"))
+    return found
 
 
-def fetch_snapshot(cache_root: Path, target_url: str, user_agent: str, extra_paths: Iterable[str]) -> SnapshotResult:
-    """Fetch target_url and assets into cache_root. Returns whether it changed."""
+def fetch_snapshot(
+    cache_root: Path,
+    target_url: str,
+    user_agent: str,
+    extra_paths: Iterable[str],
+    session: Optional[requests.Session] = None,
+    css_cache: Optional[dict[str, set[str]]] = None,
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+) -> SnapshotResult:
+    """Fetch target_url and assets into cache_root. Returns whether it changed.
+    Pass a long-lived session to keep connections alive across refreshes, and a
+    css_cache (stylesheet URL -> asset URLs) to skip re-scanning unchanged stylesheets.
+    hash_algorithm (a HASHERS key) is used for change detection.
+    """
     cache_root.mkdir(parents=True, exist_ok=True)
-    session = _requests_session(user_agent)
+    if session is None:
+        session = _requests_session(user_agent)
 
     print(f"refreshing snapshot from {target_url} to {cache_root}")
+    # One walk up front instead of a stat per asset in the download loop
+    existing = scan_cache(cache_root)
     index_path = cache_root / "index.html"
-    old_html = index_path.read_bytes() if index_path.exists() else None
+    fp_path = cache_root / ".index.fp"
 
     # Fetch main HTML
     resp = session.get(target_url)
@@ -175,77 +391,124 @@ def fetch_snapshot(cache_root: Path, target_url: str, user_agent: str, extra_pat
     resp.encoding = 'utf-8';
     html_bytes = resp.content
     html_text = resp.text
+    soup = _parse(html_text)
 
-    # Find assets
-    assets = extract_asset_urls(target_url, html_text)
+    # Find assets; raw attribute -> absolute URL, shared with the rewrite pass below
+    join_cache: dict[str, str] = {}
+    assets = extract_asset_urls_from_soup(soup, target_url, join_cache)
     for rel in extra_paths:
         assets.add(urljoin(target_url, rel))
 
     # Also fetch assets referenced by downloaded CSS files
-    # We do two passes: download CSS, then parse their contents for url(...)
-    css_assets: list[str] = []
+    # Each stylesheet is parsed for url(...) as soon as it arrives and the assets it
+    # references join the same pool, so the second wave overlaps the first.
+    scheduled: set[str] = set()
+    # URLs can collide on one cache path (host and query are dropped); only the first is fetched
+    scheduled_paths: set[Path] = set()
 
     changed_any = False
 
-    # First, download non-HTML assets (initial pass)
-    for asset_url in sorted(assets):
-        if asset_url.endswith(".html"):
-            continue
-        local = safe_path_for_url(asset_url, cache_root)
-        if download_file(session, asset_url, local):
-            changed_any = True
-        if local.suffix.lower() in {".css"} and local.exists():
-            try:
-                css_text = local.read_text(encoding="utf-8", errors="ignore")
-                css_assets.extend(list(extract_urls_from_css(asset_url, css_text)))
-            except Exception:
-                pass
-
-    # # Second, download assets discovered in CSS
-    for asset_url in sorted(set(css_assets)):
-        local = safe_path_for_url(asset_url, cache_root)
-        if download_file(session, asset_url, local):
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as ex:
+        # future -> (asset url, whether to scan it for further assets)
+        pending: dict[Future, tuple[str, bool]] = {}
+
+        def schedule(asset_url: str, scan_css: bool):
+            if asset_url in scheduled:
+                return
+            scheduled.add(asset_url)
+            local = safe_path_for_url(asset_url, cache_root)
+            if local in scheduled_paths:
+                return
+            scheduled_paths.add(local)
+            if local.parent not in existing:
+                local.parent.mkdir(parents=True, exist_ok=True)
+                existing.add(local.parent)
+            pending[ex.submit(download_file, session, asset_url, local, existing, hash_algorithm)] = (asset_url, scan_css)
+
+        # Non-HTML assets referenced by the page (initial wave)
+        for asset_url in assets:
+            if not asset_url.endswith(".html"):
+                schedule(asset_url, True)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                asset_url, scan_css = pending.pop(fut)
+                changed = fut.result()
+                if changed:
+                    changed_any = True
+                if not scan_css:
+                    continue
+                local = safe_path_for_url(asset_url, cache_root)
+                if local.suffix.lower() not in {".css"}:
+                    continue
+                if not changed and css_cache is not None and asset_url in css_cache:
+                    # Unchanged since the last scan; no need to touch the disk
+                    css_assets = css_cache[asset_url]
+                elif local.exists():
+                    try:
+                        css_assets = css_asset_urls(asset_url, local, hash_algorithm)
+                    except Exception:
+                        continue
+                    if css_cache is not None:
+                        css_cache[asset_url] = css_assets
+                else:
+                    continue
+                for css_asset in css_assets:
+                    schedule(css_asset, False)
+
+    # The rewritten index.html depends only on the page and its asset URLs; skip the
+    # rewrite and serialization when neither changed since the last snapshot
+    fp = compute_hash(html_bytes + b"\0" + b"\0".join(sorted(u.encode("utf-8") for u in assets)), hash_algorithm)
+    old_fp = fp_path.read_text(encoding="ascii").strip() if fp_path in existing else None
+    if fp != old_fp or index_path not in existing:
+        # Rewrite main HTML to local paths and store as index.html in root
+        rewrite_soup_to_local(soup, target_url, cache_root, join_cache)
+        new_html = str(soup).encode("utf-8")
+        old_html = index_path.read_bytes() if index_path in existing else None
+        if old_html != new_html:
+            atomic_write_bytes(index_path, new_html)
             changed_any = True
-
-    # Rewrite main HTML to local paths and store as index.html in root
-    rewritten = rewrite_html_to_local(html_text, target_url, cache_root)
-    new_html = rewritten.encode("utf-8")
-    if old_html != new_html:
-        index_path.write_bytes(new_html)
-        changed_any = True
+        atomic_write_bytes(fp_path, fp.encode("ascii"))
 
     return SnapshotResult(changed=changed_any, html_path=index_path)
 
 
 # ---------------------------- THREADS --------------------------------
 class RefetchThread(threading.Thread):
-    def __init__(self, cache_root: Path, target_url: str, interval: int, preload_paths: list[Path], user_agent: str, reload_q: queue.Queue):
+    def __init__(self, cache_root: Path, target_url: str, interval: int, preload_paths: list[Path], user_agent: str, hash_algorithm: str, reload_q: queue.Queue):
         super().__init__(daemon=True)
         self.cache_root = cache_root
         self.target_url = target_url
         self.interval = max(10, int(interval))
         self.preload_paths = preload_paths
         self.user_agent = user_agent
+        self.hash_algorithm = hash_algorithm
         self.reload_q = reload_q
+        # Shared across ticks so keep-alive connections survive between refreshes
+        self.session = _requests_session(user_agent)
+        # Stylesheet URL -> asset URLs it references, reused while the stylesheet is unchanged
+        self._css_cache: dict[str, set[str]] = {}
         self._stop = threading.Event()
 
     def stop(self):
         self._stop.set()
 
     def run(self):
+        fail_count = 0
         while not self._stop.is_set():
             try:
-                res = fetch_snapshot(self.cache_root, self.target_url, self.user_agent, self.preload_paths)
+                res = fetch_snapshot(self.cache_root, self.target_url, self.user_agent, self.preload_paths, self.session, self._css_cache, self.hash_algorithm)
                 if res.changed:
                     self.reload_q.put("reload")
+                fail_count = 0
             except Exception:
-                # Likely offline; just ignore
-                pass
-            # Sleep in small chunks to allow responsive shutdown
-            slept = 0
-            while slept < self.interval and not self._stop.is_set():
-                time.sleep(1)
-                slept += 1
+                # Likely offline; back off exponentially until the next success
+                # Clamped; the delay hits MAX_BACKOFF_SEC long before this bound
+                fail_count = min(fail_count + 1, 16)
+            # Returns early as soon as stop() is called
+            delay = self.interval * (2 ** fail_count)
+            self._stop.wait(min(delay, max(self.interval, MAX_BACKOFF_SEC)))
 
 
 class ReloadWatcher(threading.Thread):
@@ -253,20 +516,19 @@ class ReloadWatcher(threading.Thread):
         super().__init__(daemon=True)
         self.window = window
         self.reload_q = reload_q
-        self._stop = threading.Event()
 
     def stop(self):
-        self._stop.set()
+        # Sentinel that ends the blocking get() in run()
+        self.reload_q.put(None)
 
     def run(self):
-        while not self._stop.is_set():
-            try:
-                msg = self.reload_q.get(timeout=0.5)
-            except queue.Empty:
-                continue
+        while True:
+            msg = self.reload_q.get()
+            if msg is None:
+                return
             if msg == "reload":
                 try:
-                    self.window.evaluate_js("location.reload(true)")
+                    self.window.evaluate_js("location.reload()")
                     # self.window.load_url(self.window.url)
                 except Exception:
                     pass
@@ -287,7 +549,13 @@ def ensure_initial_cache(cfg: any) -> Path:
     target_url = cfg["target-url"]
 
     try:
-        res = fetch_snapshot(cache_root, target_url, cfg["user-agent"], cfg["preload-paths"])
+        res = fetch_snapshot(
+            cache_root,
+            target_url,
+            cfg["user-agent"],
+            cfg["preload-paths"],
+            hash_algorithm=cfg.get("hash-algorithm", DEFAULT_HASH_ALGORITHM),
+        )
         return res.html_path
     except Exception:
         # Offline: create a minimal placeholder if nothing exists
@@ -296,6 +564,8 @@ def ensure_initial_cache(cfg: any) -> Path:
         backup_index = "./assets/backup.html"
         backup_css = "./assets/backup.css"
         shutil.copy(backup_index, index) if Path(backup_index).exists() else None
+        # index.html no longer matches the last snapshot's fingerprint
+        (cache_root / ".index.fp").unlink(missing_ok=True)
         shutil.copy(backup_css, cache_root / "backup.css") if Path(backup_css).exists() else None
         if not index.exists():
             index.write_text(
@@ -331,6 +601,11 @@ def main(config: str | Path):
     cache_root: Path = Path(cfg["cache-dir"])
     port = cfg["port"]
 
+    hash_algorithm = cfg.get("hash-algorithm", DEFAULT_HASH_ALGORITHM)
+    if hash_algorithm not in HASHERS:
+        print(f"Unknown hash-algorithm {hash_algorithm!r}, expected one of {', '.join(HASHERS)}. Aborting.")
+        sys.exit(1)
+
     abs_cache_root = cache_root.resolve()
 
     index_path = ensure_initial_cache(cfg)
@@ -346,6 +621,7 @@ def main(config: str | Path):
         cfg["refresh-interval-sec"],
         [Path(p) for p in cfg["preload-paths"]],
         cfg["user-agent"],
+        hash_algorithm,
         reload_q,
     )
     watcher = ReloadWatcher(window, reload_q)